@@ -27,7 +27,6 @@ if __name__ == "__main__":
         'tables',
         'risk_distributions>=2.0.2',
         'pytest',
-        'wget'
     ]
 
     test_requirements = [
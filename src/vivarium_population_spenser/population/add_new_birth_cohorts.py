@@ -231,14 +231,17 @@ class FertilityAgeSpecificRates:
 
             if new_babies.shape[0] != 0:
 
-                new_babies['location'] = self.population_view.get(event.index).iloc[new_babies['parent_id']]['location'].values
-                new_babies['ethnicity'] = self.population_view.get(event.index).iloc[new_babies['parent_id']]['ethnicity'].values
-                new_babies['MSOA'] = self.population_view.get(event.index).iloc[new_babies['parent_id']]['MSOA'].values
-
-                new_babies['sex'] = self.randomness.choice(new_babies.index, [1.0, 2.0], additional_key='sex_choice')
-                new_babies['age'] = 0.0
-
-                self.population_view.update(new_babies[['location','ethnicity','sex','age','MSOA']])
+                # babies inherit the location and ethnicity of their mothers
+                mothers = self.population_view.subview(['location', 'ethnicity', 'MSOA']).get(event.index).iloc[new_babies['parent_id']]
+                babies_update = pd.DataFrame({'location': mothers['location'].values,
+                                              'ethnicity': mothers['ethnicity'].values,
+                                              'MSOA': mothers['MSOA'].values,
+                                              'sex': self.randomness.choice(new_babies.index, [1.0, 2.0],
+                                                                            additional_key='sex_choice'),
+                                              'age': 0.0},
+                                             index=new_babies.index)
+
+                self.population_view.update(babies_update)
 
     def load_age_specific_fertility_rate_data(self, builder):
         asfr_data = builder.data.load("covariate.age_specific_fertility_rate.estimate")
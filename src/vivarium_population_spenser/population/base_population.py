@@ -7,6 +7,8 @@ This module contains tools for sampling and assigning core demographic
 characteristics to simulants.
 
 """
+from bisect import bisect_right
+
 import pandas as pd
 import numpy as np
 
@@ -64,8 +66,8 @@ class BasePopulation:
 
     @staticmethod
     def select_sub_population_data(reference_population_data, year):
-        reference_years = sorted(set(reference_population_data.year_start))
-        ref_year_index = np.digitize(year, reference_years).item()-1
+        reference_years = np.unique(reference_population_data.year_start)
+        ref_year_index = bisect_right(reference_years, year) - 1
         return reference_population_data[reference_population_data.year_start == reference_years[ref_year_index]]
 
     # TODO: Move most of this docstring to an rst file.
@@ -131,16 +133,15 @@ class AgeOutSimulants:
     def setup(self, builder):
         if builder.configuration.population.exit_age is None:
             return
-        self.config = builder.configuration.population
+        self.exit_age = float(builder.configuration.population.exit_age)
         self.population_view = builder.population.get_view(['age', 'exit_time', 'tracked'])
         builder.event.register_listener('time_step__cleanup', self.on_time_step_cleanup)
 
     def on_time_step_cleanup(self, event):
         population = self.population_view.get(event.index)
-        max_age = float(self.config.exit_age)
-        pop = population[(population['age'] >= max_age) & population['tracked']].copy()
+        pop = population[(population['age'] >= self.exit_age) & population['tracked']].copy()
         if len(pop) > 0:
-            pop['tracked'] = pd.Series(False, index=pop.index)
+            pop['tracked'] = False
             pop['exit_time'] = event.time
             self.population_view.update(pop)
 
@@ -195,9 +196,10 @@ def generate_population(simulant_ids, creation_time, step_size, age_params,
                 Either 'Male' or 'Female'.  The sex of the simulant.
 
     """
-    simulants = pd.DataFrame({'entrance_time': pd.Series(creation_time, index=simulant_ids),
-                              'exit_time': pd.Series(pd.NaT, index=simulant_ids),
-                              'alive': pd.Series('alive', index=simulant_ids)},
+    num_simulants = len(simulant_ids)
+    simulants = pd.DataFrame({'entrance_time': np.full(num_simulants, pd.Timestamp(creation_time).to_datetime64()),
+                              'exit_time': np.full(num_simulants, np.datetime64('NaT', 'ns')),
+                              'alive': 'alive'},
                              index=simulant_ids)
     age_start = float(age_params['age_start'])
     age_end = float(age_params['age_end'])
@@ -30,26 +30,12 @@ def assign_demographic_proportions(population_data):
         various population levels.
     """
 
-    population_data['P(sex, location, age| year)'] = (
-        population_data
-            .groupby('year_start', as_index=False)
-            .apply(lambda sub_pop: sub_pop.value / sub_pop.value.sum())
-            .reset_index(level=0).value
-    )
-
-    population_data['P(sex, location | age, year)'] = (
-        population_data
-            .groupby(['age', 'year_start'], as_index=False)
-            .apply(lambda sub_pop: sub_pop.value / sub_pop.value.sum())
-            .reset_index(level=0).value
-    )
-
-    population_data['P(age | year, sex, location)'] = (
-        population_data
-            .groupby(['year_start', 'sex', 'location'], as_index=False)
-            .apply(lambda sub_pop: sub_pop.value / sub_pop.value.sum())
-            .reset_index(level=0).value
-    )
+    conditional_proportions = (('P(sex, location, age| year)', ['year_start']),
+                               ('P(sex, location | age, year)', ['age', 'year_start']),
+                               ('P(age | year, sex, location)', ['year_start', 'sex', 'location']))
+    for column, conditioned_on in conditional_proportions:
+        population_data[column] = (population_data.value
+                                   / population_data.groupby(conditioned_on).value.transform('sum'))
 
     return population_data
 
@@ -91,10 +77,10 @@ def rescale_binned_proportions(pop_data, age_start, age_end):
     for _, sub_pop in pop_data.groupby(['sex', 'location']):
 
         min_bin = sub_pop[(sub_pop.age_start <= age_start) & (age_start < sub_pop.age_end)]
-        padding_bin = sub_pop[sub_pop.age_end == float(min_bin.age_start)]
+        min_bin_start, min_bin_end = min_bin.age_start.item(), min_bin.age_end.item()
+        padding_bin = sub_pop[sub_pop.age_end == min_bin_start]
 
-        min_scale = ((float(min_bin.age_end) - age_start)
-                     / float(min_bin.age_end - min_bin.age_start))
+        min_scale = (min_bin_end - age_start) / (min_bin_end - min_bin_start)
 
         remainder = pop_data.loc[min_bin.index, columns_to_scale].values * (1 - min_scale)
         pop_data.loc[min_bin.index, columns_to_scale] *= min_scale
@@ -104,10 +90,10 @@ def rescale_binned_proportions(pop_data, age_start, age_end):
         pop_data.loc[padding_bin.index, 'age_end'] = age_start
 
         max_bin = sub_pop[(sub_pop.age_end > age_end) & (age_end >= sub_pop.age_start)]
-        padding_bin = sub_pop[sub_pop.age_start == float(max_bin.age_end)]
+        max_bin_start, max_bin_end = max_bin.age_start.item(), max_bin.age_end.item()
+        padding_bin = sub_pop[sub_pop.age_start == max_bin_end]
 
-        max_scale = ((age_end - float(max_bin.age_start))
-                     / float(max_bin.age_end - max_bin.age_start))
+        max_scale = (age_end - max_bin_start) / (max_bin_end - max_bin_start)
 
         remainder = pop_data.loc[max_bin.index, columns_to_scale] * (1 - max_scale)
         pop_data.loc[max_bin.index, columns_to_scale] *= max_scale
@@ -194,30 +180,30 @@ def smooth_ages(simulants, population_data, randomness):
         Table with same columns as `simulants` with ages smoothed out within the age bins.
     """
     simulants = simulants.copy()
+    # positions of the simulants in each (age, sex, location) bin
+    demography_positions = simulants.groupby(['age', 'sex', 'location'], sort=False).indices
     for (sex, location), sub_pop in population_data.groupby(['sex', 'location']):
 
         ages = sorted(sub_pop.age.unique())
-        younger = [float(sub_pop.loc[sub_pop.age == ages[0], 'age_start'])] + ages[:-1]
-        older = ages[1:] + [float(sub_pop.loc[sub_pop.age == ages[-1], 'age_end'])]
+        younger = [sub_pop.loc[sub_pop.age == ages[0], 'age_start'].item()] + ages[:-1]
+        older = ages[1:] + [sub_pop.loc[sub_pop.age == ages[-1], 'age_end'].item()]
 
         uniform_all = randomness.get_draw(simulants.index)
 
         for age_set in zip(ages, younger, older):
             age = AgeValues(*age_set)
 
-            has_correct_demography = ((simulants.age == age.current)
-                                      & (simulants.sex == sex) & (simulants.location == location))
-            affected = simulants[has_correct_demography]
-
-            if affected.empty:
+            positions = demography_positions.get((age.current, sex, location))
+            if positions is None:
                 continue
+            affected = simulants.iloc[positions]
 
             # bin endpoints
             endpoints, proportions = _get_bins_and_proportions(sub_pop, age)
             pdf, slope, area, cdf_inflection_point = _construct_sampling_parameters(age, endpoints, proportions)
 
             # Make a draw from a uniform distribution
-            uniform_rv = uniform_all.loc[affected.index]
+            uniform_rv = uniform_all.iloc[positions]
 
             left_sims = affected[uniform_rv <= cdf_inflection_point]
             right_sims = affected[uniform_rv > cdf_inflection_point]
@@ -251,26 +237,23 @@ def _get_bins_and_proportions(pop_data, age):
         The `AgeValues` tuple has values
             (proportion of pop in current bin, proportion of pop in previous bin, proportion of pop in next bin)
     """
-    left = float(pop_data.loc[pop_data.age == age.current, 'age_start'])
-    right = float(pop_data.loc[pop_data.age == age.current, 'age_end'])
+    # the current, younger and older bins, a neighbour missing from the table comes back as NaN
+    bins = pop_data.set_index('age').reindex([age.current, age.young, age.old])
+    bin_starts = bins['age_start'].values
+    bin_ends = bins['age_end'].values
 
-    if not pop_data.loc[pop_data.age == age.young, 'age_start'].empty:
-        lower_left = float(pop_data.loc[pop_data.age == age.young, 'age_start'])
-    else:
-        lower_left = left
-    if not pop_data.loc[pop_data.age == age.old, 'age_end'].empty:
-        upper_right = float(pop_data.loc[pop_data.age == age.old, 'age_end'])
-    else:
-        upper_right = right
+    left, right = bin_starts[0], bin_ends[0]
+    lower_left = bin_starts[1] if not np.isnan(bin_starts[1]) else left
+    upper_right = bin_ends[2] if not np.isnan(bin_ends[2]) else right
 
     # proportion in this bin and the neighboring bins
-    proportion_column = 'P(age | year, sex, location)'
+    proportions = bins['P(age | year, sex, location)'].values
     # Here we make the assumption that P(left < age < right | year, sex, location)  = p * (right - left)
     # in order to back out a point estimate for the probability density at the center of the interval.
     # This not the best assumption, but it'll do.
-    p_age = float(pop_data.loc[pop_data.age == age.current, proportion_column]/(right - left))
-    p_young = float(pop_data.loc[pop_data.age == age.young, proportion_column]/(left - lower_left)) if age.young != left else p_age
-    p_old = float(pop_data.loc[pop_data.age == age.old, proportion_column]/(upper_right - right)) if age.old != right else 0
+    p_age = proportions[0] / (right - left)
+    p_young = proportions[1] / (left - lower_left) if age.young != left else p_age
+    p_old = proportions[2] / (upper_right - right) if age.old != right else 0
 
     return EndpointValues(left, right), AgeValues(p_age, p_young, p_old)
 
@@ -52,8 +52,8 @@ class Emigration:
         emigrated_pop = prob_df.query('emigrated != "no_emigration"').copy()
 
         if not emigrated_pop.empty:
-            emigrated_pop['alive'] = pd.Series('emigrated', index=emigrated_pop.index)
-            emigrated_pop['emigrated'] = pd.Series('Yes', index=emigrated_pop.index)
+            emigrated_pop['alive'] = 'emigrated'
+            emigrated_pop['emigrated'] = 'Yes'
             emigrated_pop['exit_time'] = event.time
             self.population_view.update(emigrated_pop[['alive', 'exit_time', 'emigrated']])
 
@@ -24,7 +24,10 @@ class ImmigrationDeterministic:
         # read rates and total number of immigrants
         self.asfr_data_immigration = builder.data.load("cause.all_causes.cause_specific_immigration_rate") 
         self.simulants_per_year = builder.data.load("cause.all_causes.cause_specific_total_immigrants_per_year") 
-        self.immigration_to_MSOA = builder.data.load("cause.all_causes.immigration_to_MSOA")
+        immigration_to_MSOA = builder.data.load("cause.all_causes.immigration_to_MSOA")
+        # the MSOA destinations of every LAD, indexed by MSOA
+        self.immigration_to_MSOA_by_LAD = {LAD: LAD_destinations.set_index('MSOA')
+                                           for LAD, LAD_destinations in immigration_to_MSOA.groupby('LAD.Code')}
 
         self.simulant_creator = builder.population.get_simulant_creator()
         self.population_view = builder.population.get_view(['immigrated', 'sex', 'ethnicity', 'location', 'age','MSOA'])
@@ -89,12 +92,12 @@ class ImmigrationDeterministic:
          '''
         int_migration_matrix_rate, int_migration_matrix_names = self.get_immigration_MSOA_rates(new_residents)
 
-        # Add a random seed for numpy
-        np.random.seed(64)
+        # a seeded random number generator for numpy
+        r = np.random.RandomState(seed=64)
 
         # sample the rates for each individual and get the new wards.
-        c = int_migration_matrix_rate.cumsum(axis=1)
-        u = np.random.rand(len(c), 1)
+        c = np.cumsum(int_migration_matrix_rate, axis=1, out=int_migration_matrix_rate)
+        u = r.rand(len(c), 1)
         # get the new MSA
         MSOA_choices = (u < c).argmax(axis=1)
 
@@ -123,15 +126,15 @@ class ImmigrationDeterministic:
         if len(LAD_name)!=1:
             raise RuntimeError('The immigration module only works on the individual LAD level')
 
-        immigration_values = self.immigration_to_MSOA[self.immigration_to_MSOA['LAD.Code'].isin(LAD_name)][new_residents['MSOA_values']]
-        MSOA_order = self.immigration_to_MSOA.loc[immigration_values.index,'MSOA']
+        LAD_destinations = self.immigration_to_MSOA_by_LAD[LAD_name[0]]
+        immigration_values = LAD_destinations[new_residents['MSOA_values']]
 
-        immigration_values_t = immigration_values.transpose()
-        immigration_values_t += 1e-10
-        row_sum = immigration_values_t.sum(axis=1)
-        immigration_MSOA_rate = immigration_values_t / row_sum[:, None]
+        immigration_MSOA_rate = immigration_values.to_numpy(dtype=float).T
+        immigration_MSOA_rate += 1e-10
+        row_sum = immigration_MSOA_rate.sum(axis=1)
+        immigration_MSOA_rate /= row_sum[:, None]
 
-        return np.array(immigration_MSOA_rate), MSOA_order.values
+        return immigration_MSOA_rate, LAD_destinations.index.values
 
 
 def __repr__(self):
@@ -14,6 +14,11 @@ from vivarium.framework.utilities import rate_to_probability
 from vivarium_population_spenser.utilities import map_missing_LAD
 import os
 
+
+# simulants cannot migrate internally again within this time of their last move
+MIGRATION_INTERVAL = pd.Timedelta(days=365)
+
+
 class InternalMigration:
 
     @property
@@ -26,8 +31,10 @@ class InternalMigration:
         # mean_value_multiplier = 10.
         # int_outmigration_data["mean_value"] = int_outmigration_data["mean_value"] * mean_value_multiplier
 
-        self.internal_migration_MSOA_location_dict = builder.data.load("internal_migration.MSOA_index")
-        self.internal_migration_LAD_location_dict = builder.data.load("internal_migration.LAD_index")
+        self.internal_migration_MSOA_locations = to_location_array(builder.data.load("internal_migration.MSOA_index"))
+        # making sure that there are not LAD codes that do not exist on the rates, once for every destination
+        self.internal_migration_LAD_locations = map_missing_LAD(
+            to_location_array(builder.data.load("internal_migration.LAD_index")))
         self.MSOA_LAD_indices = builder.data.load("internal_migration.MSOA_LAD_indices")
 
         self.path_to_OD_matrices = builder.data.load("internal_migration.path_to_OD_matrices") 
@@ -57,8 +64,8 @@ class InternalMigration:
     def on_initialize_simulants(self, pop_data):
         pop_update = pd.DataFrame({'internal_outmigration': 'No',
                                    'last_outmigration_time': pd.NaT,
-                                   'previous_LAD_locations':[''],
-                                   'previous_MSOA_locations':['']},
+                                   'previous_LAD_locations': '',
+                                   'previous_MSOA_locations': ''},
                                    index=pop_data.index)
         self.population_view.update(pop_update)
 
@@ -67,15 +74,15 @@ class InternalMigration:
         pop['time_since_last_migration'] = event.time - pop['last_outmigration_time']
 
         # only allow individuals that have not migrated internaly on the last year.
-        pop = pop[(pop['time_since_last_migration'] > pd.Timedelta("365 days")) | (pop['time_since_last_migration'].notnull() == False)]
+        pop = pop[(pop['time_since_last_migration'] > MIGRATION_INTERVAL) | pop['time_since_last_migration'].isna()]
 
         prob_df = rate_to_probability(pd.DataFrame(self.int_outmigration_rate(pop.index)))
         prob_df['No'] = 1-prob_df.sum(axis=1)
         pop['internal_outmigration'] = self.random.choice(prob_df.index, prob_df.columns, prob_df)
-        int_outmigrated_pop = pop.query('internal_outmigration != "No"').copy()
+        int_outmigrated_pop = pop[pop['internal_outmigration'] != 'No'].copy()
 
         if not int_outmigrated_pop.empty:
-            int_outmigrated_pop['internal_outmigration'] = pd.Series('Yes', index=int_outmigrated_pop.index)
+            int_outmigrated_pop['internal_outmigration'] = 'Yes'
             int_outmigrated_pop['last_outmigration_time'] = event.time
             int_outmigrated_pop['previous_LAD_locations'] += int_outmigrated_pop['location']
             int_outmigrated_pop['previous_MSOA_locations'] += int_outmigrated_pop['MSOA']
@@ -102,21 +109,18 @@ class InternalMigration:
          '''
         int_migration_matrix_rate = self.get_migration_matrix(int_migration_pool)
 
-        # Add a random seed for numpy
-        np.random.seed(64)
+        # a seeded random number generator for numpy
+        r = np.random.RandomState(seed=64)
 
         # sample the rates for each individual and get the new wards.
-        c = int_migration_matrix_rate.cumsum(axis=1)
-        u = np.random.rand(len(c), 1)
+        c = np.cumsum(int_migration_matrix_rate, axis=1, out=int_migration_matrix_rate)
+        u = r.rand(len(c), 1)
         # get the new MSA
         MSOA_choices = (u < c).argmax(axis=1)
 
         # from the MSOA index get the new MSOA and LAD location name
-        MSOA_choices_name = list(map(self.internal_migration_MSOA_location_dict.get, MSOA_choices))
-        LAD_choices_name = list(map(self.internal_migration_LAD_location_dict.get, MSOA_choices))
-
-        # making sure that there are not LAD codes that do not exist on the rates.
-        LAD_choices_name = map_missing_LAD(LAD_choices_name)
+        MSOA_choices_name = list(self.internal_migration_MSOA_locations[MSOA_choices])
+        LAD_choices_name = list(self.internal_migration_LAD_locations[MSOA_choices])
 
         return (MSOA_choices_name,LAD_choices_name)
 
@@ -139,13 +143,16 @@ class InternalMigration:
 
         list_of_files = glob.glob(os.path.join(self.path_to_OD_matrices, '*.npz'))
 
-        list_of_OD_matrices = []
+        OD_matrices = np.array([])
         map_OD_file2index = {}
         for i, file in enumerate(list_of_files):
             map_OD_file2index[os.path.basename(file)] = i
             od_npz = scipy.sparse.load_npz(file)
-            list_of_OD_matrices.append(od_npz.A)
-        return np.array(list_of_OD_matrices), map_OD_file2index
+            if i == 0:
+                # one array for all the matrices, each one is densified into its own slice
+                OD_matrices = np.zeros((len(list_of_files),) + od_npz.shape, dtype=od_npz.dtype)
+            od_npz.toarray(out=OD_matrices[i])
+        return OD_matrices, map_OD_file2index
 
     def get_migration_matrix(self,int_migration_pool):
         '''
@@ -167,11 +174,27 @@ class InternalMigration:
         # Normalise the matrix to get rates
         #int_migration_matrix_rate = int_migration_matrix[:, 1:] / int_migration_matrix[:, 1:].sum(axis=1)[:, None]
 
+        # the fancy indexing above returns a copy, so it can be normalised in place
         int_migration_matrix += 1e-10
         row_sum = int_migration_matrix.sum(axis=1)
-        int_migration_matrix_rate = int_migration_matrix / row_sum[:, None]
+        int_migration_matrix /= row_sum[:, None]
 
-        return int_migration_matrix_rate
+        return int_migration_matrix
 
     def __repr__(self):
         return "InternalMigration()"
+
+
+def to_location_array(location_index):
+    """Returns the location names as an array ordered by OD matrix column.
+
+    Parameters:
+        location_index (array-like or dict): location names ordered by OD matrix column, or
+            a dict mapping the OD matrix column to the location name.
+    """
+    if isinstance(location_index, dict):
+        locations = np.full(max(location_index) + 1, None, dtype=object)
+        locations[list(location_index.keys())] = list(location_index.values())
+        return locations
+    # a copy, so the caller can remap names without touching the loaded data
+    return np.array(location_index, dtype=object)
@@ -52,12 +52,12 @@ class Mortality:
         prob_df = rate_to_probability(pd.DataFrame(self.mortality_rate(pop.index)))
         prob_df['no_death'] = 1-prob_df.sum(axis=1)
         prob_df['cause_of_death'] = self.random.choice(prob_df.index, prob_df.columns, prob_df)
-        dead_pop = prob_df.query('cause_of_death != "no_death"').copy()
+        dead_pop = prob_df[prob_df['cause_of_death'] != 'no_death'].copy()
 
         if not dead_pop.empty:
-            dead_pop['alive'] = pd.Series('dead', index=dead_pop.index)
+            dead_pop['alive'] = 'dead'
             dead_pop['exit_time'] = event.time
-            dead_pop['years_of_life_lost'] = self.life_expectancy(dead_pop.index) -  pop.loc[dead_pop.index]['age']
+            dead_pop['years_of_life_lost'] = self.life_expectancy(dead_pop.index) - pop.loc[dead_pop.index, 'age']
             self.population_view.update(dead_pop[['alive', 'exit_time', 'cause_of_death', 'years_of_life_lost']])
 
     def calculate_mortality_rate(self, index):
@@ -14,6 +14,9 @@ import pandas as pd
 from vivarium.framework import randomness
 
 
+YEAR_365_DAYS = pd.Timedelta(days=365)
+
+
 class TestPopulation():
 
     configuration_defaults = {
@@ -50,7 +53,7 @@ class TestPopulation():
         age_end = pop_data.user_data.get('age_end', self.config.population.age_end)
         age_draw = self.age_randomness.get_draw(pop_data.index)
         if age_start == age_end:
-            age = age_draw * (pop_data.creation_window / pd.Timedelta(days=365)) + age_start
+            age = age_draw * (pop_data.creation_window / YEAR_365_DAYS) + age_start
         else:
             age = age_draw * (age_end - age_start) + age_start
 
@@ -62,7 +65,7 @@ class TestPopulation():
 
     def age_simulants(self, event):
         population = self.population_view.get(event.index, query="alive == 'alive'")
-        population['age'] += event.step_size / pd.Timedelta(days=365)
+        population['age'] += event.step_size / YEAR_365_DAYS
         self.population_view.update(population)
 
 
@@ -72,30 +75,16 @@ def _build_population(core_population, path_to_data_file):
     index = core_population.index
     core_population_ = pd.read_csv(path_to_data_file)
 
-    try:
-        population = pd.DataFrame(
-            {'age': core_population_['age'].astype(float),
-             'entrance_time': core_population['entrance_time'],
-             'sex': core_population_['sex'],
-             'alive': pd.Series('alive', index=index),
-             'location': core_population_['location'],
-             'ethnicity': core_population_['ethnicity'],
-             'exit_time': pd.NaT,
-             'MSOA': core_population_['MSOA']},
-            index=index)
-    except:
-        population = pd.DataFrame(
-            {'age': core_population_['age'].astype(float),
-             'entrance_time': core_population['entrance_time'],
-             'sex': core_population_['sex'],
-             'alive': pd.Series('alive', index=index),
-             'location': core_population_['location'],
-             'ethnicity': core_population_['ethnicity'],
-             'exit_time': pd.NaT,
-             'MSOA':core_population_['MSOA']},
-            index=index)
-
-
+    population = pd.DataFrame(
+        {'age': core_population_['age'].astype(float),
+         'entrance_time': core_population['entrance_time'],
+         'sex': core_population_['sex'],
+         'alive': 'alive',
+         'location': core_population_['location'],
+         'ethnicity': core_population_['ethnicity'],
+         'exit_time': pd.NaT,
+         'MSOA': core_population_['MSOA']},
+        index=index)
 
     return population
 
@@ -233,53 +222,46 @@ def transform_rate_table(df, year_start, year_end, age_start, age_end, unique_se
     """
 
 
-    # get the unique values observed on the rate data
-    unique_locations = np.unique(df['LAD.code'])
-    unique_ethnicity = np.unique(df['ETH.group'])
-
-
-
-    # loop over the observed values to fill the ne dataframe
-    list_dic = []
-    for loc in unique_locations:
+    groups, single_row, rates = _index_by_location_and_ethnicity(df)
+    if not single_row.all():
+        print('Problem, more or less than one value in this category')
 
-        sub_loc_df = df[df['LAD.code'] == loc]
-
-        for eth in unique_ethnicity:
+    # columns are separated for male and female rates, fill the rate rows of every group at once
+    ages = np.arange(age_start, age_end)
+    values = [np.where(single_row[:, None], rates[[_rate_column_name(sex, age) for age in ages]].to_numpy(), 0)
+              for sex in unique_sex]
 
-            sub_loc_eth_df = sub_loc_df[sub_loc_df['ETH.group'] == eth]
+    return _build_rate_table(groups, values, [ages] * len(unique_sex), unique_sex, year_start, year_end)
 
-            for sex in unique_sex:
 
-                # columns are separated for male and female rates
-                if sex ==1:
-                    column_suffix = 'M'
-                else:
-                    column_suffix = 'F'
+def rate_table_columns(age_start, age_end, unique_sex=[1, 2]):
+    """Lists the columns of a LEEDS rate table that are read by ``transform_rate_table``.
 
-                for age in range(age_start,age_end):
-
-                    # cater for particular cases (age less than 1 and more than 100).
-                    if age == -1:
-                        column = column_suffix+'B.0'
-                    elif age ==100:
-                        column = column_suffix+'100.101p'
-                    else:
-                        # columns parsed to the rigth name (eg 'M.50.51' for a male between 50 and 51 yo)
-                        column = column_suffix+str(age)+'.'+str(age+1)
+    Parameters:
+    age_start (int): Minimum age observed in the rate table
+    age_end (int): Maximum age observed in the rate table
+    unique_sex (list of ints): Sex of indivuals to be considered
 
-                    if sub_loc_eth_df[column].shape[0] == 1:
-                        value = sub_loc_eth_df[column].values[0]
-                    else:
-                        value = 0
-                        print('Problem, more or less than one value in this category')
+    Returns:
+    columns (list): The location and ethnicity columns followed by the rate columns.
+    """
+    return ['LAD.code', 'ETH.group'] + [_rate_column_name(sex, age)
+                                        for sex in unique_sex
+                                        for age in range(age_start, age_end)]
 
-                    # create the rate row.
-                    dict= {'location':loc,'ethnicity':eth,'age_start':age,'age_end':age+1,'sex':sex,'year_start':year_start,'year_end':year_end, 'mean_value':value}
-                    list_dic.append(dict)
 
+def _rate_column_name(sex, age):
+    """Name of the rate table column holding the rate of a sex and single year of age."""
+    # columns are separated for male and female rates
+    column_suffix = 'M' if sex == 1 else 'F'
 
-    return pd.DataFrame(list_dic)
+    # cater for particular cases (age less than 1 and more than 100).
+    if age == -1:
+        return column_suffix + 'B.0'
+    elif age == 100:
+        return column_suffix + '100.101p'
+    # columns parsed to the rigth name (eg 'M.50.51' for a male between 50 and 51 yo)
+    return column_suffix + str(age) + '.' + str(age + 1)
 
 def prepare_dataset(dataset_path="../daedalus/persistent_data/ssm_E08000032_MSOA11_ppp_2011.csv",
                     output_path="./persistant_data/test_ssm_E08000032_MSOA11_ppp_2011.csv",
@@ -345,78 +327,77 @@ def compute_migration_rates(df_migration_numbers, df_population_total, year_star
       df (dataframe): A dataframe with the right vph format.
       """
 
-    # get the unique values observed on the rate data
-    unique_locations = np.unique(df_migration_numbers['LAD.code'])
-    unique_ethnicity = np.unique(df_migration_numbers['ETH.group'])
-
-
-    # loop over the observed values to fill the ne dataframe
-    list_dic = []
-    for loc in unique_locations:
-
-        sub_loc_df = df_migration_numbers[df_migration_numbers['LAD.code'] == loc]
-        sub_loc_df_total = df_population_total[df_population_total['LAD'] == loc]
-
-        for eth in unique_ethnicity:
-
-            sub_loc_eth_df = sub_loc_df[sub_loc_df['ETH.group'] == eth]
-            sub_loc_eth_df_total = sub_loc_df_total[(sub_loc_df_total['ETH'] == eth+"_UK") | (sub_loc_df_total['ETH'] == eth+"_NonUK")]
-
-            for sex in unique_sex:
-
-                # columns are separated for male and female rates
-                if sex == 1:
-                    column_suffix = 'M'
-                else:
-                    column_suffix = 'F'
-
-                age_sum_values = []
-                age_total_values = []
-                for age in range(age_start, age_end):
-
-                    # cater for particular cases (age less than 1 and more than 100).
-                    if age == -1:
-                        column = column_suffix + 'B.0'
-                        colum_total = 'B'
-                    elif age == 100:
-                        column = column_suffix + '100.101p'
-                    else:
-                        # columns parsed to the rigth name (eg 'M.50.51' for a male between 50 and 51 yo)
-                        column = column_suffix + str(age) + '.' + str(age + 1)
-                        colum_total = column_suffix + str(age)
-
-                    if sub_loc_eth_df[column].shape[0] == 1 and sub_loc_eth_df_total[colum_total].sum()!=0:
-                        if normalize:
-                            value = sub_loc_eth_df[column].values[0]/sub_loc_eth_df_total[colum_total].sum()
-                        else:
-                            value = sub_loc_eth_df[column].values[0]
-                    else:
-                        value = 0.0
-                    if (age < aggregate_over) | (aggregate_over==-1):
-
-                        # create the rate row.
-                        dict = {'location': loc, 'ethnicity': eth, 'age_start': age, 'age_end': age + 1, 'sex': sex,
-                                'year_start': year_start, 'year_end': year_end, 'mean_value': value}
-                        list_dic.append(dict)
-                    else:
-                        age_sum_values.append(sub_loc_eth_df[column].values[0])
-                        age_total_values.append(sub_loc_eth_df_total[colum_total].sum())
-
-                if aggregate_over != -1:
-                    if normalize:
-
-                        value = sum(age_sum_values) / sum(age_total_values)
-                    else:
-                        value = sum(age_sum_values)
-
-                    for age in range(aggregate_over,age_end):
-                       # create the rate row.
-                       dict = {'location': loc, 'ethnicity': eth, 'age_start': age, 'age_end': age + 1, 'sex': sex,
-                                'year_start': year_start, 'year_end': year_end, 'mean_value': value}
-                       list_dic.append(dict)
-
-
-
-
-    return pd.DataFrame(list_dic)
+    # rates are zero where there is not exactly one row of migration numbers per location and ethnicity
+    groups, single_row, migration = _index_by_location_and_ethnicity(df_migration_numbers)
+
+    # population totals are split into UK and non UK born, sum both into the ethnicity of the rate data
+    ages = np.arange(age_start, age_end)
+    total_columns = sorted({_population_column_name(sex, age) for sex in unique_sex for age in ages})
+    ethnicity_total = pd.Series(np.asarray(df_population_total['ETH'], dtype=object)).str.extract(
+        r'^(.*)_(?:UK|NonUK)$', expand=False)
+    population = df_population_total[total_columns].groupby(
+        [np.asarray(df_population_total['LAD'], dtype=object), ethnicity_total.to_numpy()]).sum()
+    population = population.reindex(groups, fill_value=0)
+
+    # columns are separated for male and female rates, fill the rate rows of every group at once
+    values, row_ages = [], []
+    for sex in unique_sex:
+        numbers = migration[[_rate_column_name(sex, age) for age in ages]].to_numpy(dtype=float)
+        totals = population[[_population_column_name(sex, age) for age in ages]].to_numpy(dtype=float)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sex_values = numbers / totals if normalize else numbers
+        sex_values = np.where(single_row[:, None] & (totals != 0), sex_values, 0.0)
+        sex_ages = ages
+
+        if aggregate_over != -1:
+            aggregated = ages >= aggregate_over
+            value = numbers[:, aggregated].sum(axis=1)
+            if normalize:
+                value = value / totals[:, aggregated].sum(axis=1)
+            aggregated_ages = np.arange(aggregate_over, age_end)
+            sex_values = np.hstack([sex_values[:, ~aggregated], np.repeat(value[:, None], len(aggregated_ages), axis=1)])
+            sex_ages = np.concatenate([ages[~aggregated], aggregated_ages])
+
+        values.append(sex_values)
+        row_ages.append(sex_ages)
+
+    return _build_rate_table(groups, values, row_ages, unique_sex, year_start, year_end)
+
+
+def _index_by_location_and_ethnicity(df):
+    """Indexes a LEEDS table by every pair of its observed locations and ethnicities.
+
+    Returns the pairs, whether each pair has exactly one row and the table reindexed by the pairs,
+    keeping the first row of a pair.
+    """
+    groups = pd.MultiIndex.from_product([np.unique(df['LAD.code']), np.unique(df['ETH.group'])])
+    df = df.set_index([np.asarray(df['LAD.code'], dtype=object), np.asarray(df['ETH.group'], dtype=object)])
+    single_row = (df.groupby(level=[0, 1]).size().reindex(groups, fill_value=0) == 1).to_numpy()
+    return groups, single_row, df[~df.index.duplicated()].reindex(groups)
+
+
+def _build_rate_table(groups, values, ages, unique_sex, year_start, year_end):
+    """Builds a vph rate table from per sex arrays of values with a row per group and a column per age."""
+    row_sex = np.concatenate([np.full(len(sex_ages), sex) for sex, sex_ages in zip(unique_sex, ages)])
+    row_age = np.concatenate(ages)
+    # create the rate rows, ordered by location, ethnicity, sex and age.
+    return pd.DataFrame({'location': np.repeat(groups.get_level_values(0).to_numpy(), len(row_age)),
+                         'ethnicity': np.repeat(groups.get_level_values(1).to_numpy(), len(row_age)),
+                         'age_start': np.tile(row_age, len(groups)),
+                         'age_end': np.tile(row_age + 1, len(groups)),
+                         'sex': np.tile(row_sex, len(groups)),
+                         'year_start': year_start,
+                         'year_end': year_end,
+                         'mean_value': np.hstack(values).ravel()})
+
+
+def _population_column_name(sex, age):
+    """Name of the population total column a rate column of a sex and single year of age is divided by."""
+    if age == -1:
+        return 'B'
+    elif age == 100:
+        # there is no total for the 100+ rate column, which is divided by the population aged 99.
+        age = 99
+    return ('M' if sex == 1 else 'F') + str(age)
 
@@ -77,6 +77,8 @@ class MockArtifact():
 
     def __init__(self):
         self.mocks = MOCKERS.copy()
+        # tables built from scalar mocks, so repeated loads of an entity do not rebuild them
+        self._built_tables = {}
 
     def load(self, entity_key):
         if entity_key in self.mocks:
@@ -90,13 +92,19 @@ class MockArtifact():
         if callable(value):
             value = value(entity_key)
         elif not isinstance(value, (pd.DataFrame, pd.Series)):
-            value = build_table(value, 1990, 2018)
+            if entity_key not in self._built_tables:
+                self._built_tables[entity_key] = build_table(value, 1990, 2018)
+            value = self._built_tables[entity_key]
 
         return value
 
     def write(self, entity_key, data):
         self.mocks[entity_key] = data
 
+    def write_many(self, data):
+        """Writes several entities at once from a mapping of entity key to data."""
+        self.mocks.update(data)
+
 
 class MockArtifactManager(ArtifactManager):
 
@@ -116,5 +124,8 @@ class MockArtifactManager(ArtifactManager):
     def write(self, entity_key, data):
         self.artifact.write(entity_key, data)
 
+    def write_many(self, data):
+        self.artifact.write_many(data)
+
     def _load_artifact(self, _):
         return MockArtifact()
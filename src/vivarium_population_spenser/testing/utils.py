@@ -7,12 +7,19 @@ This module contains data generation tools for testing vivarium_population_spens
 components.
 
 """
+from functools import lru_cache
 from itertools import product
 
 import pandas as pd
 
 
 def make_uniform_pop_data(age_bin_midpoint=False):
+    # the table never changes, so build it once and hand out copies that callers are free to modify
+    return _make_uniform_pop_data(age_bin_midpoint).copy()
+
+
+@lru_cache(maxsize=None)
+def _make_uniform_pop_data(age_bin_midpoint):
     age_bins = [(n, n + 5) for n in range(0, 100, 5)]
     sexes = ('Male', 'Female')
     years = zip(range(1990, 2018), range(1991, 2019))
@@ -32,3 +39,31 @@ def make_uniform_pop_data(age_bin_midpoint=False):
     if age_bin_midpoint:  # used for population tests
         pop['age'] = pop.apply(lambda row: (row['age_start'] + row['age_end']) / 2, axis=1)
     return pop
+
+
+def count_csv_rows(path):
+    """Counts the data rows of a csv file without parsing it."""
+    with open(path, 'rb') as csv_file:
+        # skip the header and any blank lines, as pandas.read_csv does
+        return sum(1 for line in csv_file if line.strip()) - 1
+
+
+def update_test_configuration(config, source, path_to_pop_file, age_start=0, age_end=100, step_size=10, **input_paths):
+    """Points a simulation configuration at its input files, sizing the population from the population file.
+
+    Extra keyword arguments are written to the configuration as input paths,
+    e.g. ``path_to_mortality_file='persistant_data/Mortality2011_LEEDS1_2.csv'``.
+    """
+    config.update({
+        'path_to_pop_file': path_to_pop_file,
+        **input_paths,
+        'population': {
+            'population_size': count_csv_rows(path_to_pop_file),
+            'age_start': age_start,
+            'age_end': age_end,
+        },
+        'time': {
+            'step_size': step_size,
+        },
+    }, source=source)
+    return config
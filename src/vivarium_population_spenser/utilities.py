@@ -15,33 +15,44 @@ import os
 import pandas as pd
 from scipy.sparse import coo_matrix
 import scipy
-import yaml
 
 def read_config_file(filename=r'../config/model_specification.yaml'):
     """read a config file"""
+    # only needed by the data preparation scripts, so the components importing this module don't pay for it
+    import yaml
     with open(filename) as inp_file_io:
         inp_file = yaml.load(inp_file_io, Loader=yaml.FullLoader)
     return inp_file
 
-def csv2sparse(path2csv="../persistant_data/od_matrices/*.csv"):
+def csv2sparse(path2csv="../persistant_data/od_matrices/*.csv", max_workers=1):
 
     list_of_files = glob.glob(path2csv)
-    
-    for i, fi in enumerate(list_of_files):
-        print(f"Processing: {fi}")
-        od = pd.read_csv(fi).values
-
-        if i == 0:
-            od_map = {}
-            for i, item in enumerate(od[:, 0]):
-                od_map[item] = i
-            od_map_pd = pd.DataFrame.from_dict(od_map, orient="index", columns=["indices"]) 
-            od_map_pd.to_csv(os.path.join(os.path.dirname(fi), os.pardir, "MSOA_to_OD_index.csv"))
-        
-        od_val = od[:, 1:]
-        od_val = od_val.astype(np.float)
-        od_val_sparse = coo_matrix(od_val)
-        scipy.sparse.save_npz(fi.split(".csv")[0] + ".npz", od_val_sparse)
+    write_index = [i == 0 for i in range(len(list_of_files))]
+
+    if max_workers == 1:
+        for fi, write in zip(list_of_files, write_index):
+            _csv2npz(fi, write)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # every worker holds a whole dense matrix, so only raise max_workers on machines with memory for that many at once
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(_csv2npz, list_of_files, write_index))
+
+def _csv2npz(fi, write_index=False):
+    print(f"Processing: {fi}")
+    od = pd.read_csv(fi).values
+
+    if write_index:
+        # the first column holds the MSOA codes, in the same order as the matrix rows
+        od_map_pd = pd.DataFrame({"indices": np.arange(len(od))}, index=od[:, 0])
+        od_map_pd.to_csv(os.path.join(os.path.dirname(fi), os.pardir, "MSOA_to_OD_index.csv"))
+
+    od_val = od[:, 1:]
+    od_val = od_val.astype(float)
+    od_val_sparse = coo_matrix(od_val)
+    scipy.sparse.save_npz(fi.split(".csv")[0] + ".npz", od_val_sparse)
 
 class EntityString(str):
     """Convenience class for representing entities as strings."""
@@ -95,6 +106,7 @@ class TargetString(str):
 
 DAYS_PER_YEAR = 365.25
 DAYS_PER_MONTH = DAYS_PER_YEAR / 12
+YEAR_DURATION = pd.Timedelta(days=DAYS_PER_YEAR)
 
 
 def to_time_delta(span_in_days: Union[int, float, str]):
@@ -107,14 +119,11 @@ def to_time_delta(span_in_days: Union[int, float, str]):
 
 def to_years(time: pd.Timedelta) -> float:
     """Converts a time delta to a float for years."""
-    return time / pd.Timedelta(days=DAYS_PER_YEAR)
+    return time / YEAR_DURATION
 
 def map_missing_LAD(LAD_names):
     '''Maps LAD names to the ones needed existing in the rates'''
 
-    missing_LAD = ['E06000052', 'E06000053', 'E06000057', 'E07000240', 'E07000241',
-       'E07000242', 'E07000243', 'E08000037', 'E09000001', 'E09000033']
-
     map_dict = {'E09000001': 'E09000001+E09000033', 'E09000033': 'E09000001+E09000033',
                 'E06000052': 'E06000052+E06000053', 'E06000053': 'E06000052+E06000053',
                 'E06000057': 'E06000048', 'E07000240': 'E07000100',
@@ -123,7 +132,7 @@ def map_missing_LAD(LAD_names):
 
     for index, value in enumerate(LAD_names):
 
-        if value in missing_LAD:
+        if value in map_dict:
             LAD_names[index] = map_dict[value]
 
     return LAD_names
\ No newline at end of file
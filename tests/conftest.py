@@ -1,9 +1,41 @@
 from pathlib import Path
+import cProfile
+import hashlib
+import re
 
+import pandas as pd
 import pytest
 from vivarium.framework.configuration import build_simulation_configuration
 from vivarium.config_tree import ConfigTree
 
+import vivarium_population_spenser.population.data_transformations as dt
+from vivarium_population_spenser.population.spenser_population import prepare_dataset
+from vivarium_population_spenser.testing.utils import make_uniform_pop_data
+
+
+# resolved once, base_config is rebuilt for every test
+CONFIG_SOURCE = str(Path(__file__).resolve())
+
+
+def pytest_addoption(parser):
+    parser.addoption('--profile', action='store_true', default=False,
+                     help='write cProfile statistics of every test to prof/<test id>.prof')
+
+
+@pytest.fixture(autouse=True)
+def profile(request):
+    """Profiles each test when pytest is run with --profile, e.g. to see whether csv reads or the simulation dominate."""
+    if not request.config.getoption('--profile'):
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    yield
+    profiler.disable()
+    profile_dir = Path(str(request.config.rootdir)) / 'prof'
+    profile_dir.mkdir(exist_ok=True)
+    profiler.dump_stats(str(profile_dir / '{}.prof'.format(re.sub(r'[^\w.-]+', '_', request.node.nodeid))))
+
 
 @pytest.fixture()
 def base_config():
@@ -17,12 +49,12 @@ def base_config():
         },
         'randomness': {'key_columns': ['entrance_time', 'age']},
         'input_data': {'location': 'Kenya'},
-    }, source=str(Path(__file__).resolve()), layer='model_override')
+    }, source=CONFIG_SOURCE, layer='model_override')
 
     return config
 
 
-@pytest.fixture(scope='module')
+@pytest.fixture(scope='session')
 def base_plugins():
     config = {'required': {
                   'data': {
@@ -33,3 +65,48 @@ def base_plugins():
     }
 
     return ConfigTree(config)
+
+
+@pytest.fixture(scope='session')
+def uniform_pop_data():
+    # Shared across all tests, so tests must not modify it in place.
+    return dt.assign_demographic_proportions(make_uniform_pop_data(age_bin_midpoint=True))
+
+
+@pytest.fixture(scope='session')
+def ssm_population_file(tmp_path_factory):
+    """Converts the daedalus test dataset once per session into a population file readable by vivarium."""
+    output_path = tmp_path_factory.mktemp('population') / 'test_ssm_E08000032_MSOA11_ppp_2011.csv'
+    prepare_dataset(dataset_path='persistant_data/1000rows_ssm_E08000032_MSOA11_ppp_2011.csv',
+                    output_path=str(output_path))
+    return str(output_path)
+
+
+@pytest.fixture(scope='session')
+def cached_csv(request):
+    """Reads csv files, keeping a pickled copy in the pytest cache so later reads skip parsing."""
+    cache_dir = Path(str(request.config.cache.makedir('csv_cache')))
+
+    def read_csv(path, where=None, **kwargs):
+        # `where` maps columns to the values to keep, only those rows are pickled.
+        path = Path(path)
+        where = {column: sorted(values) for column, values in (where or {}).items()}
+        key = hashlib.md5(repr((str(path.resolve()), sorted(where.items()),
+                                sorted(kwargs.items()))).encode()).hexdigest()
+        cache_file = cache_dir / '{}_{}.pkl'.format(path.stem, key)
+        if cache_file.exists() and cache_file.stat().st_mtime >= path.stat().st_mtime:
+            return pd.read_pickle(str(cache_file))
+        # pyarrow is not available with pandas 0.24; mapping the file at least saves the C parser
+        # from copying it through Python file reads.
+        kwargs = dict(kwargs, memory_map=True)
+        data = _select_rows(pd.read_csv(path, **kwargs), where)
+        data.to_pickle(str(cache_file))
+        return data
+
+    return read_csv
+
+
+def _select_rows(data, where):
+    for column, values in where.items():
+        data = data[data[column].isin(values)]
+    return data
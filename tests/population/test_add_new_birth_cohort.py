@@ -4,10 +4,9 @@ import numpy as np
 import pandas as pd
 import pytest
 from vivarium import InteractiveContext
-from vivarium_population_spenser.population.spenser_population import TestPopulation, build_fertility_table, transform_rate_table
-
-from vivarium_population_spenser import utilities
+from vivarium_population_spenser.population.spenser_population import TestPopulation, transform_rate_table
 from vivarium_population_spenser.population import FertilityAgeSpecificRates
+from vivarium_population_spenser.testing.utils import update_test_configuration
 
 
 @pytest.fixture()
@@ -15,32 +14,14 @@ def config(base_config):
     # change this to you own path
     # IDEA make sure test files are contained within tests/data?
     path_dir = 'persistant_data'
-    # file should have columns -> PID,location,sex,age,ethnicity
-    filename = 'Testfile.csv'
-
-    path_to_pop_file = "{}/{}".format(path_dir, filename)
-    pop_size = len(pd.read_csv(path_to_pop_file))
-
-    # mortality file provided by N. Lomax
-    filename_fertility_rate = 'Fertility2011_LEEDS1_2.csv'
-    path_to_fertility_file = "{}/{}".format(path_dir, filename_fertility_rate)
 
-
-    # FIXME could push this config up to base config in conftest.py? Exists in mortality as well.
-    base_config.update({
-        'path_to_pop_file': path_to_pop_file,
-        'path_to_fertility_file': path_to_fertility_file,
-
-        'population': {
-            'population_size': pop_size,
-            'age_start': 0,
-            'age_end': 100,
-        },
-        'time': {
-            'step_size': 1,
-        }
-    }, source=str(Path(__file__).resolve()))
-    return base_config
+    # file should have columns -> PID,location,sex,age,ethnicity
+    # fertility file provided by N. Lomax
+    return update_test_configuration(
+        base_config, source=str(Path(__file__).resolve()),
+        path_to_pop_file="{}/{}".format(path_dir, 'Testfile.csv'),
+        path_to_fertility_file="{}/{}".format(path_dir, 'Fertility2011_LEEDS1_2.csv'),
+        step_size=10)
 
 
 def test_fertility_module(config, base_plugins):
@@ -66,9 +47,10 @@ def test_fertility_module(config, base_plugins):
 
     time_start = simulation._clock.time
 
-    assert 'last_birth_time' in simulation.get_population().columns, \
+    columns = simulation.get_population().columns
+    assert 'last_birth_time' in columns, \
         'expect Fertility module to update state table.'
-    assert 'parent_id' in simulation.get_population().columns, \
+    assert 'parent_id' in columns, \
         'expect Fertility module to update state table.'
 
     simulation.run_for(duration=pd.Timedelta(days=num_days))
@@ -82,6 +64,7 @@ def test_fertility_module(config, base_plugins):
     # TODO: Write a more rigorous test.
     assert len(pop.age) > start_population_size, 'expect new simulants'
 
-    for i in range(start_population_size, len(pop)):
-        assert pop.loc[pop.iloc[i].parent_id].last_birth_time >= time_start, 'expect all children to have mothers who' \
-                                                                             ' gave birth after the simulation starts.'
+    children = pop.iloc[start_population_size:]
+    mothers_last_birth = pop.loc[children.parent_id, 'last_birth_time'].to_numpy()
+    assert np.greater_equal(mothers_last_birth, time_start.to_datetime64()).all(), \
+        'expect all children to have mothers who gave birth after the simulation starts.'
@@ -10,7 +10,6 @@ from vivarium.testing_utilities import get_randomness
 from vivarium_population_spenser import utilities
 import vivarium_population_spenser.population.base_population as bp
 import vivarium_population_spenser.population.data_transformations as dt
-from vivarium_population_spenser.testing.utils import make_uniform_pop_data
 
 
 @pytest.fixture
@@ -39,11 +38,18 @@ def initial_age_mock(mocker):
     return mocker.patch('vivarium_population_spenser.population.base_population._assign_demography_with_initial_age')
 
 
+@pytest.fixture(scope='module')
+def base_simulants():
+    # Shared across the tests of the module, copy it before passing it to anything that assigns columns.
+    return make_base_simulants()
+
+
 def make_base_simulants():
-    simulant_ids = range(100000)
+    num_simulants = 100000
+    simulant_ids = pd.RangeIndex(num_simulants)
     creation_time = pd.Timestamp(1990, 7, 2)
-    return pd.DataFrame({'entrance_time': pd.Series(pd.Timestamp(creation_time), index=simulant_ids),
-                         'exit_time': pd.Series(pd.NaT, index=simulant_ids),
+    return pd.DataFrame({'entrance_time': np.full(num_simulants, creation_time.to_datetime64()),
+                         'exit_time': np.full(num_simulants, np.datetime64('NaT', 'ns')),
                          'alive': pd.Series('alive', index=simulant_ids)},
                         index=simulant_ids)
 
@@ -53,7 +59,7 @@ def make_full_simulants():
     base_simulants['location'] = pd.Series(1, index=base_simulants.index)
     base_simulants['sex'] = pd.Series('Male', index=base_simulants.index).astype(
         pd.api.types.CategoricalDtype(categories=['Male', 'Female'], ordered=False))
-    base_simulants['age'] = np.random.uniform(0, 100, len(base_simulants))
+    base_simulants['age'] = np.random.RandomState(0).uniform(0, 100, len(base_simulants))
     base_simulants['tracked'] = pd.Series(True, index=base_simulants.index)
     return base_simulants
 
@@ -74,7 +80,8 @@ def test_BasePopulation(config, base_plugins, generate_population_mock):
     sims = make_full_simulants()
     start_population_size = len(sims)
 
-    generate_population_mock.return_value = sims.drop(columns=['tracked'])
+    sims_no_tracked = sims.drop(columns=['tracked'])
+    generate_population_mock.return_value = sims_no_tracked
 
     base_pop = bp.BasePopulation()
 
@@ -104,8 +111,7 @@ def test_BasePopulation(config, base_plugins, generate_population_mock):
     assert mock_args['population_data'].equals(sub_pop)
     assert mock_args['randomness_streams'] == base_pop.randomness
     pop = simulation.get_population()
-    for column in pop:
-        assert pop[column].equals(sims[column])
+    pd.testing.assert_frame_equal(pop.reindex(columns=sims.columns), sims)
 
     final_ages = pop.age + num_days / utilities.DAYS_PER_YEAR
 
@@ -133,23 +139,23 @@ def test_age_out_simulants(config, base_plugins):
                                     plugin_configuration=base_plugins)
     time_start = simulation._clock.time
 
-    assert len(simulation.get_population()) == len(simulation.get_population().age.unique())
+    assert simulation.get_population().age.is_unique
     simulation.run_for(duration=pd.Timedelta(days=num_days))
     pop = simulation.get_population()
-    assert len(pop) == len(pop[~pop.tracked])
+    assert not pop.tracked.any()
     exit_after_300_days = pop.exit_time >= time_start + pd.Timedelta(300, unit='D')
     exit_before_400_days = pop.exit_time <= time_start + pd.Timedelta(400, unit='D')
-    assert len(pop) == len(pop[exit_after_300_days & exit_before_400_days])
+    assert (exit_after_300_days & exit_before_400_days).all()
 
 
-def test_generate_population_age_bounds(age_bounds_mock, initial_age_mock):
+def test_generate_population_age_bounds(age_bounds_mock, initial_age_mock, uniform_pop_data, base_simulants):
     creation_time = pd.Timestamp(1990, 7, 2)
     step_size = pd.Timedelta(days=1)
     age_params = {'age_start': 0,
                   'age_end': 120}
-    pop_data = dt.assign_demographic_proportions(make_uniform_pop_data(age_bin_midpoint=True))
+    pop_data = uniform_pop_data
     r = {k: get_randomness() for k in ['general_purpose', 'bin_selection', 'age_smoothing']}
-    sims = make_base_simulants()
+    sims = base_simulants
     simulant_ids = sims.index
 
     bp.generate_population(simulant_ids, creation_time, step_size,
@@ -165,14 +171,14 @@ def test_generate_population_age_bounds(age_bounds_mock, initial_age_mock):
     initial_age_mock.assert_not_called()
 
 
-def test_generate_population_initial_age(age_bounds_mock, initial_age_mock):
+def test_generate_population_initial_age(age_bounds_mock, initial_age_mock, uniform_pop_data, base_simulants):
     creation_time = pd.Timestamp(1990, 7, 2)
     step_size = pd.Timedelta(days=1)
     age_params = {'age_start': 0,
                   'age_end': 0}
-    pop_data = dt.assign_demographic_proportions(make_uniform_pop_data(age_bin_midpoint=True))
+    pop_data = uniform_pop_data
     r = {k: get_randomness() for k in ['general_purpose', 'bin_selection', 'age_smoothing']}
-    sims = make_base_simulants()
+    sims = base_simulants
     simulant_ids = sims.index
 
     bp.generate_population(simulant_ids, creation_time, step_size,
@@ -189,31 +195,11 @@ def test_generate_population_initial_age(age_bounds_mock, initial_age_mock):
     age_bounds_mock.assert_not_called()
 
 
-def test__assign_demography_with_initial_age(config):
-    pop_data = dt.assign_demographic_proportions(make_uniform_pop_data(age_bin_midpoint=True))
-    pop_data = pop_data[pop_data.year_start == 1990]
-    simulants = make_base_simulants()
-    initial_age = 20
-    r = {k: get_randomness() for k in ['general_purpose', 'bin_selection', 'age_smoothing']}
-    step_size = pd.Timedelta(days=config.time.step_size)
-
-    simulants = bp._assign_demography_with_initial_age(simulants, pop_data, initial_age,
-                                                       step_size, r, lambda *args, **kwargs: None)
-
-    assert len(simulants) == len(simulants.age.unique())
-    assert simulants.age.min() > initial_age
-    assert simulants.age.max() < initial_age + utilities.to_years(step_size)
-    assert math.isclose(len(simulants[simulants.sex == 'Male']) / len(simulants), 0.5, abs_tol=0.01)
-    for location in simulants.location.unique():
-        assert math.isclose(len(simulants[simulants.location == location]) / len(simulants),
-                            1 / len(simulants.location.unique()), abs_tol=0.01)
-
-
-def test__assign_demography_with_initial_age_zero(config):
-    pop_data = dt.assign_demographic_proportions(make_uniform_pop_data(age_bin_midpoint=True))
+@pytest.mark.parametrize('initial_age', [20, 0])
+def test__assign_demography_with_initial_age(config, uniform_pop_data, base_simulants, initial_age):
+    pop_data = uniform_pop_data
     pop_data = pop_data[pop_data.year_start == 1990]
-    simulants = make_base_simulants()
-    initial_age = 0
+    simulants = base_simulants.copy()
     r = {k: get_randomness() for k in ['general_purpose', 'bin_selection', 'age_smoothing']}
     step_size = utilities.to_time_delta(config.time.step_size)
 
@@ -223,16 +209,15 @@ def test__assign_demography_with_initial_age_zero(config):
     assert len(simulants) == len(simulants.age.unique())
     assert simulants.age.min() > initial_age
     assert simulants.age.max() < initial_age + utilities.to_years(step_size)
-    assert math.isclose(len(simulants[simulants.sex == 'Male']) / len(simulants), 0.5, abs_tol=0.01)
-    for location in simulants.location.unique():
-        assert math.isclose(len(simulants[simulants.location == location]) / len(simulants),
-                            1 / len(simulants.location.unique()), abs_tol=0.01)
+    assert math.isclose((simulants.sex == 'Male').mean(), 0.5, abs_tol=0.01)
+    location_fractions = simulants.location.value_counts(normalize=True)
+    assert np.allclose(location_fractions, 1 / len(location_fractions), rtol=0, atol=0.01)
 
 
-def test__assign_demography_with_initial_age_error():
-    pop_data = dt.assign_demographic_proportions(make_uniform_pop_data(age_bin_midpoint=True))
+def test__assign_demography_with_initial_age_error(uniform_pop_data, base_simulants):
+    pop_data = uniform_pop_data
     pop_data = pop_data[pop_data.year_start == 1990]
-    simulants = make_base_simulants()
+    simulants = base_simulants.copy()
     initial_age = 200
     r = {k: get_randomness() for k in ['general_purpose', 'bin_selection', 'age_smoothing']}
     step_size = pd.Timedelta(days=1)
@@ -242,34 +227,36 @@ def test__assign_demography_with_initial_age_error():
                                                step_size, r, lambda *args, **kwargs: None)
 
 
-def test__assign_demography_with_age_bounds():
-    pop_data = dt.assign_demographic_proportions(make_uniform_pop_data(age_bin_midpoint=True))
+def test__assign_demography_with_age_bounds(uniform_pop_data, base_simulants):
+    pop_data = uniform_pop_data
     pop_data = pop_data[pop_data.year_start == 1990]
-    simulants = make_base_simulants()
+    simulants = base_simulants.copy()
     age_start, age_end = 0, 180
     r = {k: get_randomness(k) for k in ['general_purpose', 'bin_selection', 'age_smoothing', 'age_smoothing_age_bounds']}
 
     simulants = bp._assign_demography_with_age_bounds(simulants, pop_data, age_start,
                                                       age_end, r, lambda *args, **kwargs: None)
 
-    assert math.isclose(len(simulants[simulants.sex == 'Male']) / len(simulants), 0.5, abs_tol=0.01)
+    assert math.isclose((simulants.sex == 'Male').mean(), 0.5, abs_tol=0.01)
 
-    for location in simulants.location.unique():
-        assert math.isclose(len(simulants[simulants.location == location]) / len(simulants),
-                            1 / len(simulants.location.unique()), abs_tol=0.01)
-    ages = np.sort(simulants.age.values)
-    age_deltas = ages[1:] - ages[:-1]
+    location_fractions = simulants.location.value_counts(normalize=True)
+    assert np.allclose(location_fractions, 1 / len(location_fractions), rtol=0, atol=0.01)
+    ages = simulants.age.values
 
     age_bin_width = 5  # See `make_uniform_pop_data`
-    num_bins = len(pop_data.age.unique())
+    num_bins = pop_data.age.nunique()
     n = len(simulants)
-    assert math.isclose(age_deltas.mean(), age_bin_width * num_bins / n, rel_tol=1e-3)
-    assert age_deltas.max() < 100 * age_bin_width * num_bins / n  # Make sure there are no big age gaps.
+    expected_age_delta = age_bin_width * num_bins / n
+    # The mean gap between sorted ages telescopes to the age range over the number of gaps.
+    mean_age_delta = (ages.max() - ages.min()) / (n - 1)
+    assert math.isclose(mean_age_delta, expected_age_delta, rel_tol=1e-3)
+    age_deltas = np.diff(np.sort(ages))
+    assert age_deltas.max() < 100 * expected_age_delta  # Make sure there are no big age gaps.
 
 
-def test__assign_demography_with_age_bounds_error():
-    pop_data = dt.assign_demographic_proportions(make_uniform_pop_data(age_bin_midpoint=True))
-    simulants = make_base_simulants()
+def test__assign_demography_with_age_bounds_error(uniform_pop_data, base_simulants):
+    pop_data = uniform_pop_data
+    simulants = base_simulants.copy()
     age_start, age_end = 110, 120
     r = {k: get_randomness() for k in ['general_purpose', 'bin_selection', 'age_smoothing']}
 
@@ -2,8 +2,9 @@ import math
 
 import numpy as np
 import pandas as pd
+import pytest
 
-from vivarium.testing_utilities import get_randomness, build_table
+from vivarium.testing_utilities import get_randomness
 from vivarium_population_spenser.testing.utils import make_uniform_pop_data
 import vivarium_population_spenser.population.data_transformations as dt
 
@@ -20,8 +21,8 @@ def test_assign_demographic_proportions():
                                                       * len(pop_data.location.unique()) / len(pop_data)))
 
 
-def test_rescale_binned_proportions_full_range():
-    pop_data = dt.assign_demographic_proportions(make_uniform_pop_data(age_bin_midpoint=True))
+def test_rescale_binned_proportions_full_range(uniform_pop_data):
+    pop_data = uniform_pop_data
     pop_data = pop_data[pop_data.year_start == 1990]
 
     pop_data_scaled = dt.rescale_binned_proportions(pop_data, age_start=0, age_end=100)
@@ -30,8 +31,8 @@ def test_rescale_binned_proportions_full_range():
     assert np.allclose(pop_data['P(sex, location, age| year)'], pop_data_scaled['P(sex, location, age| year)'])
 
 
-def test_rescale_binned_proportions_clipped_ends():
-    pop_data = dt.assign_demographic_proportions(make_uniform_pop_data(age_bin_midpoint=True))
+def test_rescale_binned_proportions_clipped_ends(uniform_pop_data):
+    pop_data = uniform_pop_data
     pop_data = pop_data[pop_data.year_start == 1990]
     scale = len(pop_data.location.unique()) * len(pop_data.sex.unique())
 
@@ -43,8 +44,8 @@ def test_rescale_binned_proportions_clipped_ends():
         assert np.allclose(sub_population['P(sex, location, age| year)'], p_scaled)
 
 
-def test_rescale_binned_proportions_age_bin_edges():
-    pop_data = dt.assign_demographic_proportions(make_uniform_pop_data(age_bin_midpoint=True))
+def test_rescale_binned_proportions_age_bin_edges(uniform_pop_data):
+    pop_data = uniform_pop_data
     pop_data = pop_data[pop_data.year_start == 1990]
 
     # Test edge case where age_start/age_end fall on age bin boundaries.
@@ -55,8 +56,8 @@ def test_rescale_binned_proportions_age_bin_edges():
     assert np.allclose(pop_data_scaled['P(sex, location, age| year)'], correct_data)
 
 
-def test_smooth_ages():
-    pop_data = dt.assign_demographic_proportions(make_uniform_pop_data(age_bin_midpoint=True))
+def test_smooth_ages(uniform_pop_data):
+    pop_data = uniform_pop_data
     pop_data = pop_data[pop_data.year_start == 1990]
     simulants = pd.DataFrame({'age': [22.5]*10000 + [52.5]*10000,
                               'sex': ['Male', 'Female']*10000,
@@ -69,43 +70,21 @@ def test_smooth_ages():
     assert math.isclose(smoothed_simulants.age.mean(), 37.5, abs_tol=3*math.sqrt(13.149778198**2/2000))
 
 
-def test__get_bins_and_proportions_with_youngest_bin():
-    pop_data = dt.assign_demographic_proportions(make_uniform_pop_data(age_bin_midpoint=True))
-    pop_data = pop_data[(pop_data.year_start == 1990) & (pop_data.location == 1) & (pop_data.sex == 'Male')]
-    age = dt.AgeValues(current=2.5, young=0, old=7.5)
-    endpoints, proportions = dt._get_bins_and_proportions(pop_data, age)
-    assert endpoints.left == 0
-    assert endpoints.right == 5
-    bin_width = endpoints.right - endpoints.left
-    assert proportions.current == 1 / len(pop_data) / bin_width
-    assert proportions.young == 1 / len(pop_data) / bin_width
-    assert proportions.old == 1 / len(pop_data) / bin_width
-
-
-def test__get_bins_and_proportions_with_oldest_bin():
-    pop_data = dt.assign_demographic_proportions(make_uniform_pop_data(age_bin_midpoint=True))
-    pop_data = pop_data[(pop_data.year_start == 1990) & (pop_data.location == 1) & (pop_data.sex == 'Male')]
-    age = dt.AgeValues(current=97.5, young=92.5, old=100)
-    endpoints, proportions = dt._get_bins_and_proportions(pop_data, age)
-    assert endpoints.left == 95
-    assert endpoints.right == 100
-    bin_width = endpoints.right - endpoints.left
-    assert proportions.current == 1 / len(pop_data) / bin_width
-    assert proportions.young == 1 / len(pop_data) / bin_width
-    assert proportions.old == 0
-
-
-def test__get_bins_and_proportions_with_middle_bin():
-    pop_data = dt.assign_demographic_proportions(make_uniform_pop_data(age_bin_midpoint=True))
+@pytest.mark.parametrize('age, left, right, has_older_bin', [
+    (dt.AgeValues(current=2.5, young=0, old=7.5), 0, 5, True),
+    (dt.AgeValues(current=97.5, young=92.5, old=100), 95, 100, False),
+    (dt.AgeValues(current=22.5, young=17.5, old=27.5), 20, 25, True),
+], ids=['youngest_bin', 'oldest_bin', 'middle_bin'])
+def test__get_bins_and_proportions(uniform_pop_data, age, left, right, has_older_bin):
+    pop_data = uniform_pop_data
     pop_data = pop_data[(pop_data.year_start == 1990) & (pop_data.location == 1) & (pop_data.sex == 'Male')]
-    age = dt.AgeValues(current=22.5, young=17.5, old=27.5)
     endpoints, proportions = dt._get_bins_and_proportions(pop_data, age)
-    assert endpoints.left == 20
-    assert endpoints.right == 25
+    assert endpoints.left == left
+    assert endpoints.right == right
     bin_width = endpoints.right - endpoints.left
     assert proportions.current == 1 / len(pop_data) / bin_width
     assert proportions.young == 1 / len(pop_data) / bin_width
-    assert proportions.old == 1 / len(pop_data) / bin_width
+    assert proportions.old == (1 / len(pop_data) / bin_width if has_older_bin else 0)
 
 
 def test__construct_sampling_parameters():
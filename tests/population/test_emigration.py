@@ -1,52 +1,45 @@
 from pathlib import Path
 
-import numpy as np
 import pandas as pd
 import pytest
 from vivarium import InteractiveContext
 from vivarium_population_spenser.population.spenser_population import TestPopulation, compute_migration_rates
 from vivarium_population_spenser.population import Emigration
+from vivarium_population_spenser.testing.utils import update_test_configuration
+
+
+# change this to you own path
+PATH_DIR = 'persistant_data/'
+PATH_TO_EMIGRATION_FILE = "{}/{}".format(PATH_DIR, 'Emig_2011_2012_LEEDS2.csv')
+PATH_TO_TOTAL_POPULATION_FILE = "{}/{}".format(PATH_DIR, 'MY2011AGEN.csv')
+AGE_START = 0
+AGE_END = 100
 
 
 @pytest.fixture()
 def config(base_config):
 
-    # change this to you own path
-    path_dir= 'persistant_data/'
-
     # file should have columns -> PID,location,sex,age,ethnicity
-    filename_pop = 'Testfile.csv'
-
-    filename_emigration_name = 'Emig_2011_2012_LEEDS2.csv'
-    path_to_emigration_file = "{}/{}".format(path_dir, filename_emigration_name)
-
-    filename_total_population = 'MY2011AGEN.csv'
-    path_to_total_population_file = "{}/{}".format(path_dir, filename_total_population)
-
-    path_to_pop_file= "{}/{}".format(path_dir,filename_pop)
+    return update_test_configuration(
+        base_config, source=str(Path(__file__).resolve()),
+        path_to_pop_file="{}/{}".format(PATH_DIR, 'Testfile.csv'),
+        path_to_emigration_file=PATH_TO_EMIGRATION_FILE,
+        path_to_total_population_file=PATH_TO_TOTAL_POPULATION_FILE,
+        age_start=AGE_START, age_end=AGE_END)
 
-    pop_size = len(pd.read_csv(path_to_pop_file))
 
-    base_config.update({
+@pytest.fixture(scope='session')
+def emigration_tables(cached_csv):
+    """The emigration rate table of LAD E08000032, keyed by its artifact key."""
+    df_emigration = cached_csv(PATH_TO_EMIGRATION_FILE, where={'LAD.code': ['E08000032']})
+    df_total_population = cached_csv(PATH_TO_TOTAL_POPULATION_FILE, where={'LAD': ['E08000032']})
+    asfr_data_emigration = compute_migration_rates(df_emigration, df_total_population,
+                                                   2011, 2012, AGE_START, AGE_END, aggregate_over=75)
 
-        'path_to_pop_file':path_to_pop_file,
-        'path_to_emigration_file': path_to_emigration_file,
-        'path_to_total_population_file': path_to_total_population_file,
+    return {"covariate.age_specific_migration_rate.estimate": asfr_data_emigration}
 
-        'population': {
-            'population_size': pop_size,
-            'age_start': 0,
-            'age_end': 100,
-        },
-        'time': {
-            'step_size': 10,
-            },
-        }, source=str(Path(__file__).resolve()))
-    return base_config
 
-
-
-def test_emigration(config, base_plugins):
+def test_emigration(config, base_plugins, emigration_tables):
     start_population_size = config.population.population_size
 
     num_days = 365*10
@@ -56,18 +49,7 @@ def test_emigration(config, base_plugins):
                                     plugin_configuration=base_plugins,
                                     setup=False)
 
-
-    # setup emigration rates
-
-    df_emigration = pd.read_csv(config.path_to_emigration_file)
-    df_total_population = pd.read_csv(config.path_to_total_population_file)
-    df_emigration = df_emigration[
-        (df_emigration['LAD.code'] == 'E08000032') | (df_emigration['LAD.code'] == 'E08000032')]
-    df_total_population = df_total_population[
-        (df_total_population['LAD'] == 'E08000032') | (df_total_population['LAD'] == 'E08000032')]
-    asfr_data_emigration = compute_migration_rates(df_emigration, df_total_population, 2011, 2012, config.population.age_start, config.population.age_end,aggregate_over=75)
-    # Mock emigration Data
-    simulation._data.write("covariate.age_specific_migration_rate.estimate", asfr_data_emigration)
+    simulation._data.write_many(emigration_tables)
 
     simulation.setup()
 
@@ -78,7 +60,6 @@ def test_emigration(config, base_plugins):
     print ('emigrated',len(pop[pop['alive']=='emigrated']))
     print ('remaining population',len(pop[pop['emigrated']=='no_emigrated']))
 
-    assert (np.all(pop.alive == 'alive') == False)
-
-    assert len(pop[pop['emigrated']=='Yes']) > 0, 'expect migration'
+    assert (pop.alive != 'alive').any()
 
+    assert (pop.emigrated == 'Yes').any(), 'expect migration'
@@ -5,54 +5,64 @@ import pandas as pd
 import pytest
 from vivarium import InteractiveContext
 from vivarium_population_spenser.population.spenser_population import TestPopulation
-from vivarium_population_spenser.population.spenser_population import transform_rate_table
-from vivarium_population_spenser.population.spenser_population import prepare_dataset
 from vivarium_population_spenser.population.spenser_population import compute_migration_rates
 from vivarium_population_spenser.population import ImmigrationDeterministic as Immigration
+from vivarium_population_spenser.testing.utils import update_test_configuration
 
 
+# change this to you own path
+PATH_DIR = 'persistant_data/'
+# immigration file provided by N. Lomax
+PATH_TO_IMMIGRATION_FILE = "{}/{}".format(PATH_DIR, 'Immig_2011_2012_LEEDS2.csv')
+PATH_TO_TOTAL_POPULATION_FILE = "{}/{}".format(PATH_DIR, 'MY2011AGEN.csv')
+PATH_TO_IMMIGRATION_MSOA = "{}/{}".format(PATH_DIR, 'Immigration_MSOA_M_F.csv')
+AGE_START = 0
+AGE_END = 100
+
 
 @pytest.fixture()
 def config(base_config):
 
-    # change this to you own path
-    path_dir = 'persistant_data/'
-
     # file should have columns -> PID,location,sex,age,ethnicity
-    filename_pop = 'Testfile.csv'
-    # immigration file provided by N. Lomax
-    filename_immigration_rate = 'Immig_2011_2012_LEEDS2.csv'
-    filename_total_population = 'MY2011AGEN.csv'
-    filename_immigration_MSOA = 'Immigration_MSOA_M_F.csv'
-
-
-    path_to_pop_file = "{}/{}".format(path_dir, filename_pop)
-    path_to_immigration_file = "{}/{}".format(path_dir, filename_immigration_rate)
-    path_to_total_population_file = "{}/{}".format(path_dir, filename_total_population)
-    path_to_immigration_MSOA = "{}/{}".format(path_dir, filename_immigration_MSOA)
+    return update_test_configuration(base_config, source=str(Path(__file__).resolve()),
+                                     path_to_pop_file="{}/{}".format(PATH_DIR, 'Testfile.csv'),
+                                     path_to_immigration_file=PATH_TO_IMMIGRATION_FILE,
+                                     path_to_total_population_file=PATH_TO_TOTAL_POPULATION_FILE,
+                                     path_to_immigration_MSOA=PATH_TO_IMMIGRATION_MSOA,
+                                     age_start=AGE_START, age_end=AGE_END)
+
+
+@pytest.fixture(scope='session')
+def immigration_tables(cached_csv):
+    """The immigration rates, total immigrants and MSOA destinations of LAD E08000032, keyed by their artifact keys."""
+    df_total_population = cached_csv(PATH_TO_TOTAL_POPULATION_FILE, dtype={'LAD': 'category'})
+    df_total_population = df_total_population[
+        (df_total_population['LAD'] == 'E08000032')]
 
-    pop_size = len(pd.read_csv(path_to_pop_file))
+    # setup immigration rates
+    df_immigration = cached_csv(PATH_TO_IMMIGRATION_FILE)
+    df_immigration = df_immigration[
+        (df_immigration['LAD.code'] == 'E08000032')]
 
-    base_config.update({
-        'path_to_pop_file': path_to_pop_file,
-        'path_to_immigration_file': path_to_immigration_file,
-        'path_to_total_population_file': path_to_total_population_file,
-        'path_to_immigration_MSOA': path_to_immigration_MSOA,
+    asfr_data_immigration = compute_migration_rates(df_immigration, df_total_population,
+                                                    2011,
+                                                    2012,
+                                                    AGE_START,
+                                                    AGE_END,
+                                                    normalize=False
+                                                   )
+    # setup immigration rates
+    df_immigration_MSOA = cached_csv(PATH_TO_IMMIGRATION_MSOA)
 
-        'population': {
-            'population_size': pop_size,
-            'age_start': 0,
-            'age_end': 100,
-        },
-        'time': {
-            'step_size': 10,
-            },
-        }, source=str(Path(__file__).resolve()))
+    # read total immigrants from the file
+    total_immigrants = int(np.nansum(df_immigration.iloc[:, 4:].to_numpy(dtype=float)))
 
-    return base_config
+    return {"cause.all_causes.cause_specific_immigration_rate": asfr_data_immigration,
+            "cause.all_causes.cause_specific_total_immigrants_per_year": total_immigrants,
+            "cause.all_causes.immigration_to_MSOA": df_immigration_MSOA}
 
 
-def test_Immigration(config, base_plugins):
+def test_Immigration(config, base_plugins, immigration_tables):
     num_days = 10
     components = [TestPopulation(), Immigration()]
     simulation = InteractiveContext(components=components,
@@ -60,36 +70,12 @@ def test_Immigration(config, base_plugins):
                                     plugin_configuration=base_plugins,
                                     setup=False)
 
-    df_total_population = pd.read_csv(config.path_to_total_population_file)
-    df_total_population = df_total_population[
-        (df_total_population['LAD'] == 'E08000032')]
-    
-    # setup immigration rates
-    df_immigration = pd.read_csv(config.path_to_immigration_file)
-    df_immigration = df_immigration[
-        (df_immigration['LAD.code'] == 'E08000032')]
-    
-    asfr_data_immigration = compute_migration_rates(df_immigration, df_total_population, 
-                                                    2011, 
-                                                    2012, 
-                                                    config.population.age_start, 
-                                                    config.population.age_end,
-                                                    normalize=False
-                                                   )
-    # setup immigration rates
-    df_immigration_MSOA = pd.read_csv(config.path_to_immigration_MSOA)
-
-    # read total immigrants from the file
-    total_immigrants = int(df_immigration[df_immigration.columns[4:]].sum().sum())
-
-    simulation._data.write("cause.all_causes.cause_specific_immigration_rate", asfr_data_immigration)
-    simulation._data.write("cause.all_causes.cause_specific_total_immigrants_per_year", total_immigrants)
-    simulation._data.write("cause.all_causes.immigration_to_MSOA", df_immigration_MSOA)
+    simulation._data.write_many(immigration_tables)
 
     simulation.setup()
     simulation.run_for(duration=pd.Timedelta(days=num_days))
     pop = simulation.get_population()
 
-    assert (len(pop["entrance_time"].value_counts()) > 1)
+    assert pop["entrance_time"].nunique() > 1
 
     print (pop)
\ No newline at end of file
@@ -1,48 +1,55 @@
 from pathlib import Path
 
-import numpy as np
 import pandas as pd
 import pytest
 from vivarium import InteractiveContext
-from vivarium_population_spenser.population.spenser_population import TestPopulation, build_mortality_table, transform_rate_table
+from vivarium_population_spenser.population.spenser_population import TestPopulation, transform_rate_table
+from vivarium_population_spenser.population.spenser_population import rate_table_columns
 from vivarium_population_spenser.population import Mortality
+from vivarium_population_spenser.testing.utils import update_test_configuration
 
 
-@pytest.fixture()
-def config(base_config):
+# change this to you own path
+PATH_DIR = 'persistant_data/'
+# mortality file provided by N. Lomax
+PATH_TO_MORTALITY_FILE = "{}/{}".format(PATH_DIR, 'Mortality2011_LEEDS1_2.csv')
+AGE_START = 0
+AGE_END = 100
 
-    # change this to you own path
-    path_dir= 'persistant_data/'
 
+@pytest.fixture(params=['Testfile', 'ssm_E08000032_MSOA11_ppp_2011'])
+def path_to_pop_file(request):
     # file should have columns -> PID,location,sex,age,ethnicity
-    filename_pop = 'Testfile.csv'
-    # mortality file provided by N. Lomax
-    filename_mortality_rate = 'Mortality2011_LEEDS1_2.csv'
+    if request.param == 'Testfile':
+        return "{}/{}".format(PATH_DIR, 'Testfile.csv')
+    # read a dataset from daedalus, change columns to be readable by vivarium
+    return request.getfixturevalue('ssm_population_file')
 
-    path_to_pop_file= "{}/{}".format(path_dir,filename_pop)
-    path_to_mortality_file= "{}/{}".format(path_dir,filename_mortality_rate)
 
-    pop_size = len(pd.read_csv(path_to_pop_file))
+@pytest.fixture()
+def config(base_config, path_to_pop_file):
+    return update_test_configuration(base_config, source=str(Path(__file__).resolve()),
+                                     path_to_pop_file=path_to_pop_file,
+                                     path_to_mortality_file=PATH_TO_MORTALITY_FILE,
+                                     age_start=AGE_START, age_end=AGE_END)
 
-    base_config.update({
 
-        'path_to_pop_file':path_to_pop_file,
-        'path_to_mortality_file': path_to_mortality_file,
+@pytest.fixture(scope='session')
+def mortality_tables(cached_csv):
+    """The mortality rate table of LAD E08000032, keyed by its artifact key."""
+    df = cached_csv(PATH_TO_MORTALITY_FILE,
+                    usecols=rate_table_columns(AGE_START, AGE_END),
+                    dtype={'LAD.code': 'category'})
 
-        'population': {
-            'population_size': pop_size,
-            'age_start': 0,
-            'age_end': 100,
-        },
-        'time': {
-            'step_size': 10,
-            },
-        }, source=str(Path(__file__).resolve()))
-    return base_config
+    # to save time, only look at locatiosn existing on the test dataset.
+    mortality_rate_df = df[(df['LAD.code']=='E08000032')]
 
+    asfr_data = transform_rate_table(mortality_rate_df, 2011, 2012, AGE_START, AGE_END)
 
+    return {"cause.all_causes.cause_specific_mortality_rate": asfr_data}
 
-def test_Mortality(config, base_plugins):
+
+def test_Mortality(config, base_plugins, mortality_tables):
     num_days = 365
     components = [TestPopulation(), Mortality()]
     simulation = InteractiveContext(components=components,
@@ -50,16 +57,7 @@ def test_Mortality(config, base_plugins):
                                     plugin_configuration=base_plugins,
                                     setup=False)
 
-
-
-    df = pd.read_csv(config.path_to_mortality_file)
-
-    # to save time, only look at locatiosn existing on the test dataset.
-    mortality_rate_df = df[(df['LAD.code']=='E08000032')]
-
-    asfr_data = transform_rate_table(mortality_rate_df, 2011, 2012, config.population.age_start, config.population.age_end)
-
-    simulation._data.write("cause.all_causes.cause_specific_mortality_rate", asfr_data)
+    simulation._data.write_many(mortality_tables)
 
     simulation.setup()
     simulation.run_for(duration=pd.Timedelta(days=num_days))
@@ -68,5 +66,4 @@ def test_Mortality(config, base_plugins):
     print ('alive',len(pop[pop['alive']=='alive']))
     print ('dead',len(pop[pop['alive']!='alive']))
 
-    assert (np.all(pop.alive == 'alive') == False)
-
+    assert (pop.alive != 'alive').any()
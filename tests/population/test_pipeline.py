@@ -9,8 +9,12 @@ from vivarium_population_spenser.population import Mortality
 from vivarium_population_spenser.population import FertilityAgeSpecificRates
 from vivarium_population_spenser.population import Emigration
 from vivarium_population_spenser.population import ImmigrationDeterministic as Immigration
+from vivarium_population_spenser.testing.utils import update_test_configuration
 
 
+AGE_START = 0
+AGE_END = 100
+
 
 @pytest.fixture()
 def config(base_config):
@@ -19,51 +23,17 @@ def config(base_config):
     path_dir= 'persistant_data/'
 
     # file should have columns -> PID,location,sex,age,ethnicity
-    filename_pop = 'Testfile.csv'
-    # mortality file provided by N. Lomax
-    filename_mortality_rate = 'Mortality2011_LEEDS1_2.csv'
-
-    filename_fertility_rate = 'Fertility2011_LEEDS1_2.csv'
-    path_to_fertility_file = "{}/{}".format(path_dir, filename_fertility_rate)
-
-    filename_emigration_name = 'Emig_2011_2012_LEEDS2.csv'
-    path_to_emigration_file = "{}/{}".format(path_dir, filename_emigration_name)
-
-    filename_total_population = 'MY2011AGEN.csv'
-    path_to_total_population_file = "{}/{}".format(path_dir, filename_total_population)
-
-    # immigration file provided by N. Lomax
-    filename_immigration_rate = 'Immig_2011_2012_LEEDS2.csv'
-    path_to_immigration_file = "{}/{}".format(path_dir, filename_immigration_rate)
-
-    filename_immigration_MSOA = 'Immigration_MSOA_M_F.csv'
-    path_to_immigration_MSOA = "{}/{}".format(path_dir, filename_immigration_MSOA)
-
-    path_to_pop_file= "{}/{}".format(path_dir,filename_pop)
-    path_to_mortality_file= "{}/{}".format(path_dir,filename_mortality_rate)
-
-    pop_size = len(pd.read_csv(path_to_pop_file))
-
-    base_config.update({
-
-        'path_to_pop_file':path_to_pop_file,
-        'path_to_mortality_file': path_to_mortality_file,
-        'path_to_fertility_file': path_to_fertility_file,
-        'path_to_emigration_file': path_to_emigration_file,
-        'path_to_immigration_file': path_to_immigration_file,
-        'path_to_total_population_file': path_to_total_population_file,
-        'path_to_immigration_MSOA': path_to_immigration_MSOA,
-
-        'population': {
-            'population_size': pop_size,
-            'age_start': 0,
-            'age_end': 100,
-        },
-        'time': {
-            'step_size': 10,
-            },
-        }, source=str(Path(__file__).resolve()))
-    return base_config
+    # mortality and immigration files provided by N. Lomax
+    return update_test_configuration(
+        base_config, source=str(Path(__file__).resolve()),
+        path_to_pop_file="{}/{}".format(path_dir, 'Testfile.csv'),
+        path_to_mortality_file="{}/{}".format(path_dir, 'Mortality2011_LEEDS1_2.csv'),
+        path_to_fertility_file="{}/{}".format(path_dir, 'Fertility2011_LEEDS1_2.csv'),
+        path_to_emigration_file="{}/{}".format(path_dir, 'Emig_2011_2012_LEEDS2.csv'),
+        path_to_immigration_file="{}/{}".format(path_dir, 'Immig_2011_2012_LEEDS2.csv'),
+        path_to_total_population_file="{}/{}".format(path_dir, 'MY2011AGEN.csv'),
+        path_to_immigration_MSOA="{}/{}".format(path_dir, 'Immigration_MSOA_M_F.csv'),
+        age_start=AGE_START, age_end=AGE_END)
 
 
 
@@ -81,14 +51,12 @@ def test_pipeline(config, base_plugins):
     # setup mortality rates
     df = pd.read_csv(config.path_to_mortality_file)
     mortality_rate_df = df[(df['LAD.code']=='E08000032')]
-    asfr_data = transform_rate_table(mortality_rate_df, 2011, 2012, config.population.age_start, config.population.age_end)
-    simulation._data.write("cause.all_causes.cause_specific_mortality_rate", asfr_data)
+    asfr_data = transform_rate_table(mortality_rate_df, 2011, 2012, AGE_START, AGE_END)
 
     # setup fertility rates
     df_fertility = pd.read_csv(config.path_to_fertility_file)
     fertility_rate_df = df_fertility[(df_fertility['LAD.code'] == 'E08000032') ]
     asfr_data_fertility = transform_rate_table(fertility_rate_df, 2011, 2012, 10, 50, [2])
-    simulation._data.write("covariate.age_specific_fertility_rate.estimate", asfr_data_fertility)
 
     # setup emigration rates
     df_emigration = pd.read_csv(config.path_to_emigration_file)
@@ -97,8 +65,7 @@ def test_pipeline(config, base_plugins):
         (df_emigration['LAD.code'] == 'E08000032')]
     df_total_population = df_total_population[
         (df_total_population['LAD'] == 'E08000032')]
-    asfr_data_emigration = compute_migration_rates(df_emigration, df_total_population, 2011, 2012, config.population.age_start, config.population.age_end)
-    simulation._data.write("covariate.age_specific_migration_rate.estimate", asfr_data_emigration)
+    asfr_data_emigration = compute_migration_rates(df_emigration, df_total_population, 2011, 2012, AGE_START, AGE_END)
 
     # setup immigration rates
     df_immigration = pd.read_csv(config.path_to_immigration_file)
@@ -108,27 +75,33 @@ def test_pipeline(config, base_plugins):
     asfr_data_immigration = compute_migration_rates(df_immigration, df_total_population,
                                                     2011,
                                                     2012,
-                                                    config.population.age_start,
-                                                    config.population.age_end,
+                                                    AGE_START,
+                                                    AGE_END,
                                                     normalize=False
                                                     )
 
     # read total immigrants from the file
-    total_immigrants = int(df_immigration[df_immigration.columns[4:]].sum().sum())
-
-    simulation._data.write("cause.all_causes.cause_specific_immigration_rate", asfr_data_immigration)
-    simulation._data.write("cause.all_causes.cause_specific_total_immigrants_per_year", total_immigrants)
+    total_immigrants = int(np.nansum(df_immigration.iloc[:, 4:].to_numpy(dtype=float)))
 
     df_immigration_MSOA = pd.read_csv(config.path_to_immigration_MSOA)
-    simulation._data.write("cause.all_causes.immigration_to_MSOA", df_immigration_MSOA)
+
+    simulation._data.write_many({
+        "cause.all_causes.cause_specific_mortality_rate": asfr_data,
+        "covariate.age_specific_fertility_rate.estimate": asfr_data_fertility,
+        "covariate.age_specific_migration_rate.estimate": asfr_data_emigration,
+        "cause.all_causes.cause_specific_immigration_rate": asfr_data_immigration,
+        "cause.all_causes.cause_specific_total_immigrants_per_year": total_immigrants,
+        "cause.all_causes.immigration_to_MSOA": df_immigration_MSOA,
+    })
 
     simulation.setup()
     time_start = simulation._clock.time
 
 
-    assert 'last_birth_time' in simulation.get_population().columns, \
+    columns = simulation.get_population().columns
+    assert 'last_birth_time' in columns, \
         'expect Fertility module to update state table.'
-    assert 'parent_id' in simulation.get_population().columns, \
+    assert 'parent_id' in columns, \
         'expect Fertility module to update state table.'
 
     simulation.run_for(duration=pd.Timedelta(days=num_days))
@@ -138,15 +111,15 @@ def test_pipeline(config, base_plugins):
     print ('dead',len(pop[pop['alive']=='dead']))
     print ('emigrated',len(pop[pop['alive']=='emigrated']))
 
-    assert (np.all(pop.alive == 'alive') == False)
-    assert len(pop[pop['emigrated']=='Yes']) > 0, 'expect migration'
+    assert (pop.alive != 'alive').any()
+    assert (pop.emigrated == 'Yes').any(), 'expect migration'
 
 
     assert len(pop.age) > start_population_size, 'expect new simulants'
 
-    for i in range(start_population_size, len(pop)):
-        # skip immigrated population
-        if pop.loc[i].immigrated == 'Yes':
-            continue
-        assert pop.loc[pop.loc[i].parent_id].last_birth_time >= time_start, 'expect all children to have mothers who' \
-                                                                             ' gave birth after the simulation starts.'
+    new_simulants = pop.iloc[start_population_size:]
+    # skip immigrated population
+    children = new_simulants[new_simulants.immigrated != 'Yes']
+    mothers_last_birth = pop.loc[children.parent_id, 'last_birth_time'].to_numpy()
+    assert np.greater_equal(mothers_last_birth, time_start.to_datetime64()).all(), \
+        'expect all children to have mothers who gave birth after the simulation starts.'
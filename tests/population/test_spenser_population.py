@@ -0,0 +1,44 @@
+import pandas as pd
+
+from vivarium_population_spenser.population.spenser_population import compute_migration_rates, transform_rate_table
+
+
+def test_transform_rate_table():
+    df = pd.DataFrame({'LAD.code': ['L1', 'L1', 'L2', 'L2'],
+                       'ETH.group': ['A', 'B', 'A', 'A'],
+                       'M0.1': [.1, .2, .3, .3], 'M1.2': [.4, .5, .6, .6],
+                       'F0.1': [.7, .8, .9, .9], 'F1.2': [1., 1.1, 1.2, 1.2]})
+
+    rates = transform_rate_table(df, 2011, 2012, 0, 2)
+
+    assert list(rates.columns) == ['location', 'ethnicity', 'age_start', 'age_end', 'sex',
+                                   'year_start', 'year_end', 'mean_value']
+    assert list(rates.ethnicity) == ['A'] * 4 + ['B'] * 4 + ['A'] * 4 + ['B'] * 4
+    assert list(rates.sex) == [1, 1, 2, 2] * 4
+    assert list(rates.age_end) == [1, 2] * 8
+    # L2 has two rows for ethnicity A and none for B
+    assert list(rates.mean_value) == [.1, .4, .7, 1., .2, .5, .8, 1.1] + [0.] * 8
+
+
+def test_compute_migration_rates():
+    df_migration = pd.DataFrame({'LAD.code': ['L1', 'L2', 'L2'],
+                                 'ETH.group': ['A', 'A', 'A'],
+                                 'M0.1': [2., 1., 1.], 'M1.2': [3., 1., 1.],
+                                 'F0.1': [4., 1., 1.], 'F1.2': [5., 1., 1.]})
+    df_total = pd.DataFrame({'LAD': ['L1', 'L1', 'L2'],
+                             'ETH': ['A_UK', 'A_NonUK', 'A_UK'],
+                             'M0': [10, 10, 10], 'M1': [30, 0, 10],
+                             'F0': [8, 0, 10], 'F1': [0, 0, 10]})
+
+    rates = compute_migration_rates(df_migration, df_total, 2011, 2012, 0, 2)
+
+    assert list(rates.columns) == ['location', 'ethnicity', 'age_start', 'age_end', 'sex',
+                                   'year_start', 'year_end', 'mean_value']
+    assert list(rates.location) == ['L1'] * 4 + ['L2'] * 4
+    assert list(rates.sex) == [1, 1, 2, 2] * 2
+    assert list(rates.age_start) == [0, 1] * 4
+    # no population to divide by for L1 females aged 1, and L2 has more than one row of migration numbers
+    assert list(rates.mean_value) == [0.1, 0.1, 0.5, 0.] + [0.] * 4
+
+    aggregated = compute_migration_rates(df_migration, df_total, 2011, 2012, 0, 2, normalize=False, aggregate_over=1)
+    assert list(aggregated.mean_value[:4]) == [2., 3., 4., 5.]